@@ -6,19 +6,44 @@ Provides REST API endpoints for the dual-engine TTS system.
 import os
 import sys
 import asyncio
+import base64
+import hashlib
+import json
+import re
+import tempfile
+import time
 import uuid
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, nullcontext
+from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Annotated, Dict, List, Literal, Optional, Any, Tuple
 import logging
 
+import anyio
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 # Add parent directory to path to import solution.py
 sys.path.append(str(Path(__file__).parent.parent))
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
-from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from starlette.datastructures import QueryParams
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, Response
+import orjson
+from pydantic import BaseModel, Field, StringConstraints, TypeAdapter, ValidationError
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from arq import create_pool
+from arq.connections import RedisSettings
+from arq.constants import default_queue_name
 
 # Import from solution.py in parent directory
 from solution import DualTTSSystem
@@ -27,28 +52,124 @@ from solution import DualTTSSystem
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Paths whose responses are WAV audio; PCM doesn't compress, so skip gzip
+AUDIO_PATH_PREFIXES = ("/static/audio/", "/api/audio/")
+
+# Parses ?inline= exactly like the endpoint's bool query parameter (1, true, on, yes, ...)
+QUERY_BOOL = TypeAdapter(bool)
+
+class AudioBypassGZipMiddleware(GZipMiddleware):
+    """GZip middleware that passes audio responses through untouched"""
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and self._is_audio_request(scope):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+    
+    @staticmethod
+    def _is_audio_request(scope) -> bool:
+        path = scope["path"]
+        if path.startswith(AUDIO_PATH_PREFIXES):
+            return True
+        if path != "/api/synthesize":
+            return False
+        inline = QueryParams(scope.get("query_string", b"")).get("inline")
+        if inline is None:
+            return False
+        try:
+            return QUERY_BOOL.validate_python(inline)
+        except ValidationError:
+            return False
+
+class ImmutableStaticFiles(StaticFiles):
+    """Static files named by content hash, so clients and CDNs may keep them forever"""
+    
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Emotional TTS API",
     description="REST API for Emotional Speech Generation using Dual-Engine TTS System",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Mount static files
+# Initialize TTS system; the app manages its own audio cache under static/audio
+tts_system = DualTTSSystem(use_cache=False)
+
+# Async task state lives in Redis so every worker sees every task;
+# the TTL bounds storage without a manual cleanup pass
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+TASK_TTL_SECONDS = 3600
+redis_client = Redis.from_url(REDIS_URL, decode_responses=True)
+
+# Content-addressed audio cache
+AUDIO_DIR = Path("static/audio")
+CACHE_DIR = AUDIO_DIR / "cache"
+CACHE_KEY_FIELDS = ("text", "style", "intensity", "engine", "voice", "speed")
+
+# Least recently used cache entries are evicted beyond this total size
+CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_MB", "1024")) * 1024 * 1024
+
+# Temp .part.wav files left by interrupted syntheses are deleted after this age
+FILE_MAX_AGE_SECONDS = 3600
+CLEANUP_INTERVAL_SECONDS = int(os.getenv("TTS_CLEANUP_INTERVAL", "300"))
+
+# Voice previews are rendered once per voice and kept
+PREVIEW_DIR = AUDIO_DIR / "previews"
+PREVIEW_TEXT = "Hello, this is a voice preview. How do you like this voice?"
+
+# Short clips requested inline are synthesized to RAM-backed scratch space,
+# streamed back, and deleted without touching the cache
+INLINE_MAX_CHARS = 200
+INLINE_SCRATCH_DIR = Path("/dev/shm") if os.path.isdir("/dev/shm") else Path(tempfile.gettempdir())
+
+# Create output directories once instead of on every request
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
+PREVIEW_DIR.mkdir(parents=True, exist_ok=True)
+AUDIO_ROOT = AUDIO_DIR.resolve()
+
+# Mount static files (the more specific cache mount must come first)
+app.mount("/static/audio/cache", ImmutableStaticFiles(directory=str(CACHE_DIR)), name="audio_cache")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Initialize TTS system
-tts_system = DualTTSSystem()
+# Compress JSON/HTML responses
+app.add_middleware(AudioBypassGZipMiddleware, minimum_size=512)
+
+# When nginx fronts the app, set this to its internal location for AUDIO_DIR
+# (e.g. /internal/audio/) and downloads are handed off via X-Accel-Redirect
+X_ACCEL_PREFIX = os.getenv("TTS_X_ACCEL_PREFIX")
 
-# Storage for async tasks
-task_storage: Dict[str, Dict[str, Any]] = {}
+# In-flight syntheses by cache key; duplicate requests await the same future
+INFLIGHT: Dict[str, "asyncio.Future[Optional[Path]]"] = {}
+
+# Cap concurrent model runs; excess requests queue instead of contending
+SYNTH_SEM = asyncio.Semaphore(int(os.getenv("TTS_MAX_CONCURRENCY", "2")))
+SYNC_SYNTH_SEM = asyncio.Semaphore(int(os.getenv("TTS_MAX_SYNC_CONCURRENCY", "2")))
+
+# Blocking model calls run here so they never stall the event loop.
+# Threads (not processes) so every call shares the already-loaded models.
+EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("TTS_EXECUTOR_WORKERS", "4")),
+    thread_name_prefix="tts"
+)
 
 # Pydantic models
+# Engine styles (used by the web form) plus the ids listed by /api/styles
+StyleName = Literal[
+    "neutral", "enthusiastic", "somber", "confident", "authoritative",
+    "happy", "sad", "angry", "excited", "calm", "dramatic"
+]
+
 class TTSRequest(BaseModel):
-    text: str
-    style: str = "neutral"
-    intensity: int = 50
-    engine: str = "auto"
+    text: Annotated[str, StringConstraints(min_length=1, max_length=1000, strip_whitespace=True)]
+    style: StyleName = "neutral"
+    intensity: Annotated[int, Field(ge=0, le=100)] = 50
+    engine: Literal["auto", "coqui", "pyttsx3"] = "auto"
     voice: Optional[str] = None
     speed: Optional[float] = None
 
@@ -64,8 +185,14 @@ class SystemStatus(BaseModel):
     pyttsx3_available: bool
     default_engine: str
     total_requests: int
+    queue_depth: int
     uptime: str
 
+TERMINAL_STATUSES = ("completed", "failed")
+
+# WebSocket task streams re-check the stored task this often when no update arrives
+TASK_POLL_SECONDS = 15.0
+
 class TaskStatus(BaseModel):
     task_id: str
     status: str  # "pending", "processing", "completed", "failed"
@@ -73,10 +200,258 @@ class TaskStatus(BaseModel):
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
-# Global counters
-request_counter = 0
+# Global counters; the request total lives in Redis so it spans all workers
+REQUEST_COUNTER_KEY = "tts:requests"
+synth_queue_depth = 0
 start_time = datetime.now()
 
+@asynccontextmanager
+async def synthesis_slot(semaphore: asyncio.Semaphore):
+    """Hold a synthesis slot, counting requests still waiting for one"""
+    global synth_queue_depth
+    synth_queue_depth += 1
+    try:
+        await semaphore.acquire()
+    finally:
+        synth_queue_depth -= 1
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+async def count_request():
+    """Bump the shared request counter; a Redis outage must not fail the request"""
+    try:
+        await redis_client.incr(REQUEST_COUNTER_KEY)
+    except RedisError as e:
+        logger.warning(f"Request counter unavailable: {e}")
+
+async def run_synthesis(**kwargs) -> bool:
+    """Run tts_system.synthesize in the executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(EXECUTOR, partial(tts_system.synthesize, **kwargs))
+
+def new_file_token() -> str:
+    """22-char filesystem-safe token carrying a full UUID's 128 bits"""
+    return base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b"=").decode()
+
+def _cache_key(request: TTSRequest) -> str:
+    """Hash the request fields that deterministically define the audio"""
+    payload = {field: getattr(request, field) for field in CACHE_KEY_FIELDS}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+async def synthesize_cached(request: TTSRequest,
+                            semaphore: Optional[asyncio.Semaphore] = None) -> Optional[Path]:
+    """Return the cached audio file for a request, synthesizing it on a miss.
+    
+    If a semaphore is given, the model call itself waits for a slot.
+    """
+    key = _cache_key(request)
+    cache_path = CACHE_DIR / f"{key}.wav"
+    
+    if await anyio.to_thread.run_sync(touch_if_exists, cache_path):
+        return cache_path
+    
+    # Piggyback on an identical synthesis that is already running
+    pending = INFLIGHT.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+    
+    future = asyncio.get_running_loop().create_future()
+    INFLIGHT[key] = future
+    result = None
+    # Unique per writer so other workers never share a temp file
+    part_path = CACHE_DIR / f"{key}.{new_file_token()}.part.wav"
+    try:
+        
+        async with synthesis_slot(semaphore) if semaphore else nullcontext():
+            success = await run_synthesis(
+                text=request.text,
+                output_path=part_path,
+                engine=request.engine,
+                style=request.style,
+                intensity=request.intensity,
+                voice=request.voice,
+                speed=request.speed
+            )
+        
+        if success and await anyio.to_thread.run_sync(commit_part_file, part_path, cache_path):
+            result = cache_path
+        return result
+    finally:
+        # Waiters see a failed synthesis as None
+        future.set_result(result)
+        INFLIGHT.pop(key, None)
+        if result is None:
+            await anyio.to_thread.run_sync(_unlink_files, [part_path])
+
+def task_channel(task_id: str) -> str:
+    """Pub/sub channel carrying a task's state changes"""
+    return f"task:{task_id}:events"
+
+async def save_task(task_id: str, task: Dict[str, Any]):
+    """Persist async task state with an expiry and notify subscribers"""
+    payload = json.dumps(task)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.set(f"task:{task_id}", payload, ex=TASK_TTL_SECONDS)
+        pipe.publish(task_channel(task_id), payload)
+        await pipe.execute()
+
+async def load_task(task_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch async task state, or None if unknown or expired"""
+    data = await redis_client.get(f"task:{task_id}")
+    return json.loads(data) if data is not None else None
+
+async def update_task(task_id: str, **fields):
+    """Merge fields into the stored task state"""
+    task = await load_task(task_id) or {}
+    task.update(fields)
+    await save_task(task_id, task)
+
+async def synthesize_inline(request: TTSRequest) -> Response:
+    """Return the audio bytes directly instead of a URL to fetch later"""
+    key = _cache_key(request)
+    cache_path = CACHE_DIR / f"{key}.wav"
+    
+    if await anyio.to_thread.run_sync(touch_if_exists, cache_path):
+        return FileResponse(cache_path, media_type="audio/wav")
+    
+    pending = INFLIGHT.get(key)
+    if pending is not None:
+        output_path = await asyncio.shield(pending)
+        if output_path is not None:
+            return FileResponse(output_path, media_type="audio/wav")
+    
+    scratch_path = INLINE_SCRATCH_DIR / f"tts_{new_file_token()}.wav"
+    async with synthesis_slot(SYNC_SYNTH_SEM):
+        success = await run_synthesis(
+            text=request.text,
+            output_path=scratch_path,
+            engine=request.engine,
+            style=request.style,
+            intensity=request.intensity,
+            voice=request.voice,
+            speed=request.speed
+        )
+    
+    if not success or not await anyio.Path(scratch_path).exists():
+        raise HTTPException(status_code=500, detail="Speech synthesis failed")
+    
+    # Scratch file is removed once the response has been sent
+    return FileResponse(
+        scratch_path,
+        media_type="audio/wav",
+        background=BackgroundTask(_unlink_files, [scratch_path])
+    )
+
+def touch_if_exists(path: Path) -> bool:
+    """Mark a cache entry as recently used; False if it does not exist"""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+def commit_part_file(part_path: Path, final_path: Path) -> bool:
+    """Atomically move a finished temp file into place so readers never see partial audio"""
+    if not part_path.exists():
+        return False
+    os.replace(part_path, final_path)
+    return True
+
+def _unlink_files(paths: List[Path]) -> int:
+    """Delete files, ignoring ones already gone; returns the number removed"""
+    deleted_count = 0
+    for file_path in paths:
+        try:
+            file_path.unlink()
+            deleted_count += 1
+        except FileNotFoundError:
+            pass
+    return deleted_count
+
+def _expired_part_files(cutoff_time: float) -> List[Path]:
+    """Temp files older than cutoff_time that a synthesis never committed"""
+    expired = []
+    for directory in (CACHE_DIR, PREVIEW_DIR):
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".part.wav"):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff_time:
+                        expired.append(Path(entry.path))
+                except FileNotFoundError:
+                    pass
+    return expired
+
+def _lru_cache_victims() -> List[Path]:
+    """Least recently used cache entries that push the cache past CACHE_MAX_BYTES"""
+    entries = []
+    total_size = 0
+    with os.scandir(CACHE_DIR) as scan:
+        for entry in scan:
+            if not entry.name.endswith(".wav") or entry.name.endswith(".part.wav"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+            total_size += stat.st_size
+    
+    victims = []
+    for _, size, path in sorted(entries):
+        if total_size <= CACHE_MAX_BYTES:
+            break
+        victims.append(path)
+        total_size -= size
+    return victims
+
+def _purge_expired_files_sync() -> int:
+    """Scan for and delete expired temp files and evicted cache entries in one thread hop"""
+    expired = _expired_part_files(time.time() - FILE_MAX_AGE_SECONDS)
+    return _unlink_files(expired + _lru_cache_victims())
+
+async def purge_expired_files() -> int:
+    """Delete temp audio files past FILE_MAX_AGE_SECONDS and trim the cache to its size cap"""
+    return await anyio.to_thread.run_sync(_purge_expired_files_sync)
+
+async def periodic_cleanup():
+    """Purge expired files forever so disk usage stays bounded"""
+    while True:
+        await asyncio.sleep(CLEANUP_INTERVAL_SECONDS)
+        try:
+            deleted_count = await purge_expired_files()
+            if deleted_count:
+                logger.info(f"Periodic cleanup removed {deleted_count} files")
+        except Exception as e:
+            logger.error(f"Periodic cleanup error: {e}")
+
+def audio_url_for(path: Path) -> str:
+    """Public URL of a file under the static directory"""
+    return f"/{path.as_posix()}"
+
+@app.on_event("startup")
+async def start_periodic_cleanup():
+    """Schedule the background cleanup loop"""
+    app.state.cleanup_task = asyncio.create_task(periodic_cleanup())
+
+@app.on_event("startup")
+async def connect_job_queue():
+    """Open the Arq pool used to enqueue async synthesis jobs"""
+    app.state.arq_pool = await create_pool(RedisSettings.from_dsn(REDIS_URL))
+
+@app.on_event("shutdown")
+async def close_job_queue():
+    """Close the Arq pool"""
+    await app.state.arq_pool.aclose()
+
+@app.on_event("shutdown")
+async def stop_periodic_cleanup():
+    """Cancel the background cleanup loop"""
+    app.state.cleanup_task.cancel()
+
 @app.get("/")
 async def root():
     """Serve the main frontend page"""
@@ -85,165 +460,200 @@ async def root():
 @app.get("/api/status", response_model=SystemStatus)
 async def get_system_status():
     """Get system status and engine availability"""
-    global request_counter, start_time
-    
     status = tts_system.get_status()
+    
+    # Redis-backed figures read as 0 during an outage; engine status still answers
+    try:
+        total_requests = int(await redis_client.get(REQUEST_COUNTER_KEY) or 0)
+        # Async jobs waiting or running in Arq, plus sync requests waiting in this worker
+        async_backlog = await redis_client.zcard(default_queue_name)
+    except RedisError as e:
+        logger.warning(f"Redis unavailable for status counters: {e}")
+        total_requests = 0
+        async_backlog = 0
     uptime = str(datetime.now() - start_time).split('.')[0]
     
     return SystemStatus(
         coqui_available=status["coqui"],
         pyttsx3_available=status["pyttsx3"],
         default_engine="coqui" if status["coqui"] else "pyttsx3",
-        total_requests=request_counter,
+        total_requests=total_requests,
+        queue_depth=async_backlog + synth_queue_depth,
         uptime=uptime
     )
 
-@app.get("/api/voices")
-async def get_available_voices():
-    """Get list of available voices with detailed information"""
-    try:
-        voices_data = {
-            "success": True,
-            "pyttsx3": [],
-            "coqui": []
-        }
-        
-        # Get pyttsx3 voices if available
-        if tts_system.pyttsx and tts_system.pyttsx.available:
-            try:
-                import pyttsx3
-                temp_engine = pyttsx3.init()
-                voices = temp_engine.getProperty('voices')
+# Voice name tokens that identify gender, and language code prefixes
+MALE_NAMES = frozenset({'david', 'mark', 'paul', 'richard', 'james'})
+FEMALE_NAMES = frozenset({'zira', 'hazel', 'susan', 'irina', 'huihui', 'hanhan', 'helena', 'sabina'})
+LANG_MAP = {
+    'ru': "Russian",
+    'zh-cn': "Chinese (Simplified)",
+    'zh-tw': "Chinese (Taiwan)",
+    'en': "English (US)",
+}
+NAME_TOKEN_RE = re.compile(r"[a-z]+")
+
+def language_code(languages: Any) -> str:
+    """First language tag of a driver voice as text.
+    
+    espeak reports bytes with a leading priority byte (e.g. b"\\x05en-us").
+    """
+    if not isinstance(languages, list) or not languages:
+        return "en-US"
+    code = languages[0]
+    if isinstance(code, bytes):
+        code = code.decode("latin-1")
+    code = "".join(ch for ch in str(code) if ch.isprintable()).strip()
+    return code or "en-US"
+
+@lru_cache(maxsize=1)
+def enumerate_voices() -> Dict[str, Any]:
+    """Build the voice list once; voices rarely change while the server runs"""
+    voices_data = {
+        "success": True,
+        "pyttsx3": [],
+        "coqui": []
+    }
+    
+    # Get pyttsx3 voices if available
+    if tts_system.pyttsx and tts_system.pyttsx.available:
+        try:
+            voices = tts_system.pyttsx.list_voices()
+            
+            for i, voice in enumerate(voices):
+                name = voice['name']
+                languages = voice['languages']
                 
-                for i, voice in enumerate(voices):
-                    name = getattr(voice, 'name', f'Voice {i}')
-                    languages = getattr(voice, 'languages', ['Unknown'])
-                    
-                    # Determine gender based on voice name patterns
+                # Determine gender based on voice name tokens
+                tokens = set(NAME_TOKEN_RE.findall(name.lower()))
+                if tokens & MALE_NAMES:
+                    gender = "male"
+                elif tokens & FEMALE_NAMES:
                     gender = "female"
-                    if any(male_name in name.lower() for male_name in ['david', 'mark', 'paul', 'richard', 'james']):
-                        gender = "male"
-                    elif any(female_name in name.lower() for female_name in ['zira', 'hazel', 'susan', 'irina', 'huihui', 'hanhan', 'helena', 'sabina']):
-                        gender = "female"
-                    else:
-                        gender = "neutral"
-                    
-                    # Determine language display
-                    lang_display = "English (US)"
-                    if isinstance(languages, list) and len(languages) > 0:
-                        lang_code = languages[0]
-                        if 'ru' in lang_code.lower():
-                            lang_display = "Russian"
-                        elif 'zh-cn' in lang_code.lower():
-                            lang_display = "Chinese (Simplified)"
-                        elif 'zh-tw' in lang_code.lower():
-                            lang_display = "Chinese (Taiwan)"
-                        elif 'en' in lang_code.lower():
-                            lang_display = "English (US)"
-                    
-                    voices_data["pyttsx3"].append({
-                        "id": str(i),
-                        "name": name,
-                        "gender": gender,
-                        "language": lang_display,
-                        "language_code": languages[0] if isinstance(languages, list) and languages else "en-US",
-                        "engine": "pyttsx3",
-                        "description": f"{name} - {gender.title()} voice ({lang_display})"
-                    })
+                else:
+                    gender = "neutral"
                 
-                temp_engine.stop()
-                del temp_engine
+                # Determine language display
+                lang_code = language_code(languages)
+                lang_display = next(
+                    (display for code, display in LANG_MAP.items() if code in lang_code.lower()),
+                    "English (US)"
+                )
                 
-            except Exception as e:
-                logger.warning(f"Could not load pyttsx3 voices: {e}")
-        
-        # Get Coqui voices if available
-        if tts_system.coqui and tts_system.coqui.available:
-            # Add some common Coqui TTS voices
-            coqui_voices = [
-                {"name": "jenny", "gender": "female", "language": "English (US)", "quality": "high"},
-                {"name": "ljspeech", "gender": "female", "language": "English (US)", "quality": "high"},
-            ]
-            
-            for voice in coqui_voices:
-                voices_data["coqui"].append({
-                    "id": voice["name"],
-                    "name": voice["name"].title(),
-                    "gender": voice["gender"],
-                    "language": voice["language"],
-                    "language_code": "en-US",
-                    "engine": "coqui",
-                    "quality": voice["quality"],
-                    "description": f"{voice['name'].title()} - {voice['gender'].title()} voice ({voice['language']}, {voice['quality']} quality)"
+                voices_data["pyttsx3"].append({
+                    "id": str(i),
+                    "name": name,
+                    "gender": gender,
+                    "language": lang_display,
+                    "language_code": lang_code,
+                    "engine": "pyttsx3",
+                    "description": f"{name} - {gender.title()} voice ({lang_display})"
                 })
+            
+        except Exception as e:
+            logger.warning(f"Could not load pyttsx3 voices: {e}")
+    
+    # Get Coqui voices if available
+    if tts_system.coqui and tts_system.coqui.available:
+        # Add some common Coqui TTS voices
+        coqui_voices = [
+            {"name": "jenny", "gender": "female", "language": "English (US)", "quality": "high"},
+            {"name": "ljspeech", "gender": "female", "language": "English (US)", "quality": "high"},
+        ]
         
-        return voices_data
+        for voice in coqui_voices:
+            voices_data["coqui"].append({
+                "id": voice["name"],
+                "name": voice["name"].title(),
+                "gender": voice["gender"],
+                "language": voice["language"],
+                "language_code": "en-US",
+                "engine": "coqui",
+                "quality": voice["quality"],
+                "description": f"{voice['name'].title()} - {voice['gender'].title()} voice ({voice['language']}, {voice['quality']} quality)"
+            })
+    
+    return voices_data
+
+@lru_cache(maxsize=1)
+def voices_json() -> bytes:
+    """Serialized voice list, encoded once per cache generation"""
+    return orjson.dumps(enumerate_voices())
+
+@app.get("/api/voices")
+async def get_available_voices():
+    """Get list of available voices with detailed information"""
+    try:
+        return Response(content=voices_json(), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error getting voices: {e}")
         return {"success": False, "error": str(e)}
 
+@app.post("/api/voices/refresh")
+async def refresh_voices():
+    """Re-enumerate voices, e.g. after installing new system voices"""
+    if tts_system.pyttsx:
+        tts_system.pyttsx.refresh_voices()
+    enumerate_voices.cache_clear()
+    voices_json.cache_clear()
+    return await get_available_voices()
+
+# Warm the voice cache so the first /api/voices hit serves ready bytes;
+# a driver problem here must not stop the app from starting
+try:
+    voices_json()
+except Exception as e:
+    logger.warning(f"Could not pre-build the voice list: {e}")
+
+# Emotional styles advertised to clients
+STYLES = (
+    {"id": "neutral", "name": "Neutral", "description": "Standard speech"},
+    {"id": "happy", "name": "Happy", "description": "Cheerful and upbeat"},
+    {"id": "sad", "name": "Sad", "description": "Melancholic and slow"},
+    {"id": "angry", "name": "Angry", "description": "Intense and forceful"},
+    {"id": "excited", "name": "Excited", "description": "Energetic and fast"},
+    {"id": "calm", "name": "Calm", "description": "Peaceful and steady"},
+    {"id": "dramatic", "name": "Dramatic", "description": "Theatrical and expressive"},
+)
+STYLES_RESPONSE = {"success": True, "styles": STYLES}
+
+@lru_cache(maxsize=1)
+def styles_json() -> bytes:
+    """Serialized styles payload, encoded on first use"""
+    return orjson.dumps(STYLES_RESPONSE)
+
 @app.get("/api/styles")
 async def get_emotional_styles():
     """Get list of available emotional styles"""
-    return {
-        "success": True,
-        "styles": [
-            {"id": "neutral", "name": "Neutral", "description": "Standard speech"},
-            {"id": "happy", "name": "Happy", "description": "Cheerful and upbeat"},
-            {"id": "sad", "name": "Sad", "description": "Melancholic and slow"},
-            {"id": "angry", "name": "Angry", "description": "Intense and forceful"},
-            {"id": "excited", "name": "Excited", "description": "Energetic and fast"},
-            {"id": "calm", "name": "Calm", "description": "Peaceful and steady"},
-            {"id": "dramatic", "name": "Dramatic", "description": "Theatrical and expressive"}
-        ]
-    }
+    return Response(content=styles_json(), media_type="application/json")
 
 @app.post("/api/synthesize", response_model=TTSResponse)
-async def synthesize_speech(request: TTSRequest):
-    """Synchronous TTS synthesis"""
-    global request_counter
-    request_counter += 1
+async def synthesize_speech(request: TTSRequest, inline: bool = False):
+    """Synchronous TTS synthesis.
+    
+    With ?inline=true, short texts get the WAV in the response body.
+    """
+    await count_request()
     
     try:
-        # Validate input
-        if not request.text.strip():
-            raise HTTPException(status_code=400, detail="Text cannot be empty")
-        
-        if len(request.text) > 1000:
-            raise HTTPException(status_code=400, detail="Text too long (max 1000 characters)")
-        
-        # Generate unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"tts_{timestamp}_{uuid.uuid4().hex[:8]}.wav"
-        output_path = Path("static/audio") / filename
-        
-        # Ensure audio directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if inline and len(request.text) <= INLINE_MAX_CHARS:
+            return await synthesize_inline(request)
         
         # Record start time
-        start_time_synthesis = datetime.now()
+        start_ns = time.perf_counter_ns()
         
-        # Synthesize speech
-        success = tts_system.synthesize(
-            text=request.text,
-            output_path=output_path,
-            engine=request.engine,
-            style=request.style,
-            intensity=request.intensity,
-            voice=request.voice,
-            speed=request.speed
-        )
+        # Synthesize speech (served from cache when possible)
+        output_path = await synthesize_cached(request, semaphore=SYNC_SYNTH_SEM)
         
         # Calculate processing time
-        processing_time = (datetime.now() - start_time_synthesis).total_seconds()
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
         
-        if success and output_path.exists():
-            audio_url = f"/static/audio/{filename}"
+        if output_path is not None:
             return TTSResponse(
                 success=True,
                 message="Speech synthesized successfully",
-                audio_url=audio_url,
+                audio_url=audio_url_for(output_path),
                 processing_time=processing_time
             )
         else:
@@ -254,29 +664,24 @@ async def synthesize_speech(request: TTSRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/synthesize-async", response_model=TTSResponse)
-async def synthesize_speech_async(request: TTSRequest, background_tasks: BackgroundTasks):
-    """Asynchronous TTS synthesis for longer texts"""
-    global request_counter
-    request_counter += 1
+async def synthesize_speech_async(request: TTSRequest):
+    """Asynchronous TTS synthesis for longer texts, run by the Arq worker (worker.py)"""
+    await count_request()
     
     try:
-        # Validate input
-        if not request.text.strip():
-            raise HTTPException(status_code=400, detail="Text cannot be empty")
-        
         # Generate task ID
         task_id = str(uuid.uuid4())
         
         # Initialize task status
-        task_storage[task_id] = {
+        await save_task(task_id, {
             "status": "pending",
             "progress": 0,
-            "created_at": datetime.now(),
+            "created_at": datetime.now().isoformat(),
             "request": request.dict()
-        }
+        })
         
-        # Add background task
-        background_tasks.add_task(process_async_synthesis, task_id, request)
+        # Hand off to the dedicated synthesis workers
+        await app.state.arq_pool.enqueue_job("synth_task", request.dict(), task_id)
         
         return TTSResponse(
             success=True,
@@ -291,10 +696,75 @@ async def synthesize_speech_async(request: TTSRequest, background_tasks: Backgro
 @app.get("/api/task/{task_id}", response_model=TaskStatus)
 async def get_task_status(task_id: str):
     """Get status of async synthesis task"""
-    if task_id not in task_storage:
+    task = await load_task(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    task = task_storage[task_id]
+    return task_status(task_id, task)
+
+@app.websocket("/ws/task/{task_id}")
+async def task_updates(websocket: WebSocket, task_id: str):
+    """Push async task state changes until the task finishes"""
+    await websocket.accept()
+    pubsub = redis_client.pubsub()
+    client_event = update = None
+    try:
+        # Subscribe before reading the current state so no update is missed
+        await pubsub.subscribe(task_channel(task_id))
+        
+        task = await load_task(task_id)
+        if task is None:
+            await websocket.close(code=4404, reason="Task not found")
+            return
+        
+        await websocket.send_json(task_status(task_id, task).dict())
+        
+        # Completes when the client disconnects (or sends something, which is ignored)
+        client_event = asyncio.create_task(websocket.receive())
+        
+        while task["status"] not in TERMINAL_STATUSES:
+            # A pending read is kept, never cancelled, so pub/sub stays in sync
+            if update is None:
+                update = asyncio.create_task(
+                    pubsub.get_message(ignore_subscribe_messages=True, timeout=TASK_POLL_SECONDS)
+                )
+            await asyncio.wait({update, client_event}, return_when=asyncio.FIRST_COMPLETED)
+            
+            if client_event.done():
+                if client_event.result()["type"] == "websocket.disconnect":
+                    return
+                client_event = asyncio.create_task(websocket.receive())
+            if not update.done():
+                continue
+            
+            message = update.result()
+            update = None
+            if message is not None:
+                task = json.loads(message["data"])
+            else:
+                # No update for a while: the task may have expired or its job died
+                latest = await load_task(task_id)
+                if latest is None:
+                    await websocket.close(code=4404, reason="Task expired")
+                    return
+                if latest == task:
+                    continue
+                task = latest
+            await websocket.send_json(task_status(task_id, task).dict())
+        
+        await websocket.close()
+        
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for pending in (client_event, update):
+            if pending is not None:
+                pending.cancel()
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
+
+def task_status(task_id: str, task: Dict[str, Any]) -> TaskStatus:
+    """Public view of stored task state"""
     return TaskStatus(
         task_id=task_id,
         status=task["status"],
@@ -304,126 +774,180 @@ async def get_task_status(task_id: str):
     )
 
 async def process_async_synthesis(task_id: str, request: TTSRequest):
-    """Background task for async synthesis"""
-    try:
-        # Update status
-        task_storage[task_id]["status"] = "processing"
-        task_storage[task_id]["progress"] = 10
-        
-        # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"tts_async_{timestamp}_{task_id[:8]}.wav"
-        output_path = Path("static/audio") / filename
-        
-        # Ensure directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Update progress
-        task_storage[task_id]["progress"] = 30
-        
-        # Synthesize speech
-        start_time = datetime.now()
-        success = tts_system.synthesize(
-            text=request.text,
-            output_path=output_path,
-            engine=request.engine,
-            style=request.style,
-            intensity=request.intensity,
-            voice=request.voice,
-            speed=request.speed
-        )
-        
-        processing_time = (datetime.now() - start_time).total_seconds()
-        
-        if success and output_path.exists():
-            # Task completed successfully
-            task_storage[task_id].update({
-                "status": "completed",
-                "progress": 100,
-                "result": {
-                    "audio_url": f"/static/audio/{filename}",
-                    "processing_time": processing_time,
-                    "file_size": output_path.stat().st_size
-                }
-            })
-        else:
-            # Task failed
-            task_storage[task_id].update({
-                "status": "failed",
-                "progress": 100,
-                "error": "Speech synthesis failed"
-            })
+    """Run one async synthesis job and record its outcome (called from worker.py)"""
+    async with synthesis_slot(SYNTH_SEM):
+        try:
+            # Update status
+            await update_task(task_id, status="processing", progress=10)
             
-    except Exception as e:
-        logger.error(f"Async task {task_id} failed: {e}")
-        task_storage[task_id].update({
-            "status": "failed",
-            "progress": 100,
-            "error": str(e)
-        })
+            # Update progress
+            await update_task(task_id, progress=30)
+            
+            # Synthesize speech (served from cache when possible)
+            start_ns = time.perf_counter_ns()
+            output_path = await synthesize_cached(request)
+            
+            processing_time = (time.perf_counter_ns() - start_ns) / 1e9
+            
+            if output_path is not None:
+                # Task completed successfully
+                await update_task(
+                    task_id,
+                    status="completed",
+                    progress=100,
+                    result={
+                        "audio_url": audio_url_for(output_path),
+                        "processing_time": processing_time,
+                        "file_size": (await anyio.Path(output_path).stat()).st_size
+                    }
+                )
+            else:
+                # Task failed
+                await update_task(
+                    task_id,
+                    status="failed",
+                    progress=100,
+                    error="Speech synthesis failed"
+                )
+            
+        except asyncio.CancelledError:
+            # Arq cancels the job on job_timeout or worker shutdown; record it before unwinding
+            logger.error(f"Async task {task_id} timed out or was cancelled")
+            await asyncio.shield(update_task(
+                task_id, status="failed", progress=100, error="Task timed out or was cancelled"
+            ))
+            raise
+            
+        except Exception as e:
+            logger.error(f"Async task {task_id} failed: {e}")
+            await update_task(task_id, status="failed", progress=100, error=str(e))
+
+@app.get("/api/audio/{file_path:path}")
+async def download_audio(file_path: str):
+    """Download a generated audio file, delegating the transfer to nginx if configured"""
+    full_path = Path(await anyio.Path(AUDIO_DIR / file_path).resolve())
+    if (AUDIO_ROOT not in full_path.parents or full_path.suffix != ".wav"
+            or not await anyio.Path(full_path).is_file()):
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    
+    headers = {"Content-Disposition": f'attachment; filename="{full_path.name}"'}
+    
+    if X_ACCEL_PREFIX:
+        # nginx streams the file itself with sendfile
+        relative = full_path.relative_to(AUDIO_ROOT).as_posix()
+        headers["X-Accel-Redirect"] = f"{X_ACCEL_PREFIX.rstrip('/')}/{relative}"
+        return Response(headers=headers, media_type="audio/wav")
+    
+    return FileResponse(full_path, media_type="audio/wav", headers=headers)
 
 @app.delete("/api/cleanup")
 async def cleanup_old_files():
-    """Clean up old audio files (older than 1 hour)"""
+    """Delete expired temp audio files now; also runs periodically"""
     try:
-        audio_dir = Path("static/audio")
-        if not audio_dir.exists():
-            return {"success": True, "message": "No audio directory found"}
-        
-        cutoff_time = datetime.now() - timedelta(hours=1)
-        deleted_count = 0
-        
-        for file_path in audio_dir.glob("*.wav"):
-            if datetime.fromtimestamp(file_path.stat().st_mtime) < cutoff_time:
-                file_path.unlink()
-                deleted_count += 1
-        
-        # Also cleanup old tasks
-        old_tasks = [
-            task_id for task_id, task in task_storage.items()
-            if task["created_at"] < cutoff_time
-        ]
-        for task_id in old_tasks:
-            del task_storage[task_id]
+        deleted_count = await purge_expired_files()
         
+        # Task state expires on its own via the Redis TTL
         return {
             "success": True,
-            "message": f"Cleaned up {deleted_count} files and {len(old_tasks)} tasks"
+            "message": f"Cleaned up {deleted_count} files"
         }
         
     except Exception as e:
         logger.error(f"Cleanup error: {e}")
         return {"success": False, "error": str(e)}
 
+def preview_path_for(engine: str, voice_id: str) -> Path:
+    """Location of the pre-rendered preview for a voice"""
+    return PREVIEW_DIR / f"{engine}_{voice_id}.wav"
+
+def known_voices() -> List[Tuple[str, str]]:
+    """(engine, voice_id) pairs from the cached voice list"""
+    voices = enumerate_voices()
+    return [(engine, voice["id"]) for engine in ("pyttsx3", "coqui") for voice in voices[engine]]
+
+async def render_preview(engine: str, voice_id: str) -> Optional[Path]:
+    """Synthesize the preview sentence for a voice unless it already exists"""
+    output_path = preview_path_for(engine, voice_id)
+    if await anyio.Path(output_path).exists():
+        return output_path
+    
+    part_path = PREVIEW_DIR / f"{engine}_{voice_id}.{new_file_token()}.part.wav"
+    
+    success = await run_synthesis(
+        text=PREVIEW_TEXT,
+        output_path=part_path,
+        engine=engine,
+        voice=voice_id,
+        style="neutral",
+        intensity=50
+    )
+    
+    if success and await anyio.to_thread.run_sync(commit_part_file, part_path, output_path):
+        return output_path
+    await anyio.to_thread.run_sync(_unlink_files, [part_path])
+    return None
+
+async def prebake_previews():
+    """Render previews for every known voice so the endpoint never synthesizes"""
+    for engine, voice_id in known_voices():
+        try:
+            if await render_preview(engine, voice_id) is None:
+                logger.warning(f"Could not pre-render preview for {engine}:{voice_id}")
+        except Exception as e:
+            logger.warning(f"Preview pre-render error for {engine}:{voice_id}: {e}")
+
+def try_prebake_lock():
+    """Open and lock the prebake lock file; None if another worker holds it"""
+    lock_file = open(PREVIEW_DIR / ".prebake.lock", "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+async def prebake_previews_once(lock_file):
+    """Pre-render previews, then let the next worker start take the lock"""
+    try:
+        await prebake_previews()
+    finally:
+        if lock_file is not None:
+            lock_file.close()
+
+@app.on_event("startup")
+async def start_preview_prebake():
+    """Pre-render voice previews in the background, in one worker only"""
+    lock_file = None
+    if fcntl is not None:
+        lock_file = try_prebake_lock()
+        if lock_file is None:
+            logger.info("Another worker is pre-rendering voice previews")
+            return
+    app.state.preview_task = asyncio.create_task(prebake_previews_once(lock_file))
+
 @app.post("/api/preview-voice")
 async def preview_voice(request: dict):
-    """Generate a short voice preview"""
+    """Return the pre-rendered preview for a voice"""
     try:
         voice_id = request.get("voice_id", "")
         engine = request.get("engine", "auto")
         
-        # Short preview text
-        preview_text = "Hello, this is a voice preview. How do you like this voice?"
+        # The frontend sends voices as "<engine>:<id>"
+        if ":" in voice_id:
+            engine, voice_id = voice_id.split(":", 1)
+        elif engine == "auto":
+            engine = tts_system.primary.name
         
-        # Generate unique filename
-        preview_id = str(uuid.uuid4())[:8]
-        output_path = Path("static/audio") / f"preview_{preview_id}.wav"
-        output_path.parent.mkdir(exist_ok=True)
+        if (engine, voice_id) not in known_voices():
+            return {"success": False, "error": f"Unknown voice: {voice_id}"}
         
-        # Synthesize preview
-        success = tts_system.synthesize(
-            text=preview_text,
-            output_path=output_path,
-            engine=engine,
-            voice=voice_id,
-            style="neutral",
-            intensity=50
-        )
+        # Normally already rendered at startup; render now if not yet done
+        output_path = await render_preview(engine, voice_id)
         
-        if success:
+        if output_path is not None:
             return {
                 "success": True,
-                "audio_url": f"/static/audio/preview_{preview_id}.wav",
+                "audio_url": audio_url_for(output_path),
                 "message": "Voice preview generated successfully"
             }
         else:
@@ -435,4 +959,14 @@ async def preview_voice(request: dict):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # Multiple workers share task state through Redis; use
+    # `uvicorn app:app --reload` for development instead
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("TTS_WORKERS", os.cpu_count() or 1)),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop has no Windows build
+        http="httptools",
+        reload=False
+    )
@@ -373,7 +373,11 @@ class EmotionalTTSApp {
             const result = await response.json();
             
             if (!response.ok) {
-                throw new Error(result.detail || 'Synthesis failed');
+                // Validation errors (422) carry a list of {loc, msg} objects
+                const detail = Array.isArray(result.detail)
+                    ? result.detail.map(err => err.msg).join('; ')
+                    : result.detail;
+                throw new Error(detail || 'Synthesis failed');
             }
             
             if (result.success) {
@@ -402,7 +406,7 @@ class EmotionalTTSApp {
         audioPlayer.load();
         
         // Update download link
-        downloadLink.href = result.audio_url;
+        downloadLink.href = result.audio_url.replace('/static/audio/', '/api/audio/');
         downloadLink.download = `speech_${Date.now()}.wav`;
         
         // Update metadata
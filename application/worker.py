@@ -0,0 +1,26 @@
+"""
+Arq worker for asynchronous TTS synthesis jobs.
+Runs queued /api/synthesize-async requests outside the API processes.
+
+Start from the application directory with:
+    arq worker.WorkerSettings
+"""
+
+import os
+
+from arq.connections import RedisSettings
+
+from app import REDIS_URL, TTSRequest, process_async_synthesis
+
+
+async def synth_task(ctx, request_dict: dict, task_id: str):
+    """Synthesize one queued request; progress is written to the Redis task store"""
+    await process_async_synthesis(task_id, TTSRequest(**request_dict))
+
+
+class WorkerSettings:
+    """Arq worker configuration"""
+    functions = [synth_task]
+    redis_settings = RedisSettings.from_dsn(REDIS_URL)
+    max_jobs = int(os.getenv("TTS_MAX_CONCURRENCY", "2"))
+    job_timeout = 600
@@ -1,12 +1,32 @@
 #!/usr/bin/env python3
 
 import argparse
+import hashlib
+import importlib.util
+import json
 import logging
 import os
+import re
+import shutil
+import socket
+import socketserver
+import stat
 import sys
+import tempfile
+import threading
+import uuid
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 # Suppress warnings for cleaner output
 warnings.filterwarnings("ignore", category=UserWarning)
@@ -16,6 +36,87 @@ warnings.filterwarnings("ignore", category=FutureWarning)
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# Local cache for synthesized audio (and other reusable artifacts)
+CACHE_ROOT = Path(os.environ.get("TTS_CACHE", "~/.cache/esg_tts")).expanduser()
+
+def _default_socket_path() -> str:
+    """Per-user daemon socket: $XDG_RUNTIME_DIR, else a uid-tagged name in the temp dir"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "esg_tts.sock")
+    name = f"esg_tts-{os.getuid()}.sock" if hasattr(os, "getuid") else "esg_tts.sock"
+    return os.path.join(tempfile.gettempdir(), name)
+
+
+# Unix socket of the resident synthesis daemon (--serve)
+SOCKET_PATH = os.environ.get("TTS_SOCKET") or _default_socket_path()
+
+# pyttsx3 renders into RAM-backed scratch space before moving the result into place
+SCRATCH_DIR = "/dev/shm" if os.path.ismount("/dev/shm") else tempfile.gettempdir()
+
+# Voice-name fragments that suggest a gender
+FEMALE_INDICATORS = (
+    'zira', 'hazel', 'susan', 'anna', 'helena', 'sabina', 'katja',
+    'female', 'woman', 'girl', 'lady', 'ms', 'miss', 'mrs',
+    'f+', '+f', '(f)', '[f]', 'fem'
+)
+MALE_INDICATORS = (
+    'david', 'mark', 'richard', 'george', 'james', 'paul',
+    'male', 'man', 'boy', 'gentleman', 'mr', 'mister',
+    'm+', '+m', '(m)', '[m]', 'masc'
+)
+
+# One case-insensitive search per name instead of a substring test per indicator
+_FEMALE_RE = re.compile("|".join(map(re.escape, FEMALE_INDICATORS)), re.IGNORECASE)
+_MALE_RE = re.compile("|".join(map(re.escape, MALE_INDICATORS)), re.IGNORECASE)
+
+
+def _detect_gender(voice_name: str) -> str:
+    """Detect gender from voice name"""
+    if _FEMALE_RE.search(voice_name) is not None:
+        return 'female'
+    elif _MALE_RE.search(voice_name) is not None:
+        return 'male'
+    else:
+        return 'unknown'
+
+
+# Coqui speed per style: (base speed, True if higher intensity slows it down).
+# None keeps the model defaults.
+_COQUI_STYLE = MappingProxyType({
+    "neutral": None,
+    "enthusiastic": (1.1, False),
+    "somber": (0.8, True),
+    "confident": (1.0, False),
+    "authoritative": (0.9, False),
+})
+
+# pyttsx3 (rate multiplier, volume multiplier) per style
+_PYTTSX_STYLE = MappingProxyType({
+    "neutral": (1.0, 1.0),
+    "enthusiastic": (1.3, 1.2),
+    "somber": (0.7, 0.8),
+    "confident": (1.1, 1.1),
+    "authoritative": (0.9, 1.0),
+})
+
+
+def _resolve_style(style: str) -> str:
+    """Map styles without engine tables (e.g. the web app's extra moods) to neutral"""
+    return style if style in _PYTTSX_STYLE else "neutral"
+
+
+def _atomic_copy(src: Union[str, Path], dst: Union[str, Path]):
+    """Copy src to a temp file beside dst, then rename it over dst"""
+    directory, name = os.path.split(dst)
+    tmp = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
 
 class TTSEngine:
     """Base class for TTS engines"""
@@ -28,7 +129,7 @@ class TTSEngine:
         """Check if engine is available"""
         return self.available
         
-    def synthesize(self, text: str, output_path: Path, style: str = "neutral", 
+    def synthesize(self, text: str, output_path: str, style: str = "neutral", 
                   intensity: int = 50, **kwargs) -> bool:
         """Synthesize text to audio file"""
         raise NotImplementedError
@@ -37,75 +138,151 @@ class TTSEngine:
 class CoquiTTSEngine(TTSEngine):
     """Coqui TTS Engine - Primary choice for high quality neural synthesis"""
     
+    # Lightweight model
+    MODEL_NAME = "tts_models/en/ljspeech/tacotron2-DDC"
+    
     def __init__(self):
         super().__init__("coqui")
         self.tts = None
-        self._check_and_init()
+        self._load_lock = threading.Lock()
+        # The model is not safe for concurrent inference calls
+        self._synth_lock = threading.Lock()
+        self._probe_availability()
         
-    def _check_and_init(self):
-        """Initialize Coqui TTS if available"""
+    def _probe_availability(self):
+        """Check that Coqui TTS is installed without importing it or loading the model"""
+        # Probing the submodule imports only the light TTS package, never torch;
+        # find_spec raises instead of returning None when that parent is missing
         try:
-            from TTS.api import TTS
-            
-            # Try to initialize with a lightweight model
-            model_name = "tts_models/en/ljspeech/tacotron2-DDC"
-            logger.info(f"Initializing Coqui TTS with model: {model_name}")
-            
-            self.tts = TTS(model_name=model_name, progress_bar=False)
-            self.available = True
-            logger.info("✓ Coqui TTS engine initialized successfully")
-            
+            self.available = importlib.util.find_spec("TTS.api") is not None
         except ImportError:
-            logger.warning("Coqui TTS not available - install with: pip install TTS torch")
             self.available = False
+        if not self.available:
+            logger.warning("Coqui TTS not available - install with: pip install TTS torch")
+    
+    def _ensure_loaded(self) -> bool:
+        """Load the model on first use; thread-safe and attempted only once"""
+        if self.tts is not None:
+            return True
+        
+        with self._load_lock:
+            if self.tts is not None:
+                return True
+            if not self.available:
+                return False
+            
+            try:
+                from TTS.api import TTS
+                
+                logger.info(f"Initializing Coqui TTS with model: {self.MODEL_NAME}")
+                self.tts = self._load_from_manifest(TTS)
+                if self.tts is None:
+                    self.tts = TTS(model_name=self.MODEL_NAME, progress_bar=False)
+                    self._save_manifest()
+                logger.info("✓ Coqui TTS engine initialized successfully")
+                return True
+                
+            except Exception as e:
+                logger.warning(f"Coqui TTS initialization failed: {e}")
+                self.available = False
+                return False
+    
+    def _manifest_path(self) -> Path:
+        """Location of the resolved model file manifest for MODEL_NAME"""
+        digest = hashlib.blake2b(self.MODEL_NAME.encode("utf-8"), digest_size=8).hexdigest()
+        return CACHE_ROOT / f"coqui_{digest}.json"
+    
+    def _load_from_manifest(self, tts_class) -> Optional[Any]:
+        """Load checkpoints recorded by an earlier run, skipping the model manager"""
+        try:
+            manifest = json.loads(self._manifest_path().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        
+        # A cleared model directory invalidates the manifest
+        if not all(Path(p).exists() for p in manifest.values() if p):
+            return None
+        
+        try:
+            logger.info("Loading Coqui TTS from cached model paths")
+            return tts_class(progress_bar=False, **manifest)
         except Exception as e:
-            logger.warning(f"Coqui TTS initialization failed: {e}")
-            self.available = False
+            logger.warning(f"Cached Coqui model paths failed to load: {e}")
+            return None
     
-    def synthesize(self, text: str, output_path: Path, style: str = "neutral", 
+    def _resolved_paths(self) -> Dict[str, Optional[str]]:
+        """Checkpoint and config files the model manager resolved for MODEL_NAME"""
+        synthesizer = getattr(self.tts, "synthesizer", None)
+        paths = {
+            "model_path": getattr(synthesizer, "tts_checkpoint", None),
+            "config_path": getattr(synthesizer, "tts_config_path", None),
+            "vocoder_path": getattr(synthesizer, "vocoder_checkpoint", None),
+            "vocoder_config_path": None
+        }
+        # The synthesizer swaps vocoder_config for the loaded config object, so ask
+        # the model manager for the path (files are already downloaded by now)
+        if paths["vocoder_path"]:
+            try:
+                paths["vocoder_config_path"] = self.tts.download_model_by_name(self.MODEL_NAME)[3]
+            except Exception as e:
+                logger.debug(f"Could not resolve Coqui vocoder config path: {e}")
+        return {key: value if isinstance(value, str) else None for key, value in paths.items()}
+    
+    def _save_manifest(self):
+        """Record the resolved model files; failures only cost the next warm start"""
+        try:
+            manifest = self._resolved_paths()
+            if not manifest["model_path"] or not manifest["config_path"]:
+                return
+            if manifest["vocoder_path"] and not manifest["vocoder_config_path"]:
+                return
+            
+            manifest_path = self._manifest_path()
+            tmp = manifest_path.with_name(f".{manifest_path.name}.{os.getpid()}.tmp")
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(manifest), encoding="utf-8")
+            os.replace(tmp, manifest_path)
+        except Exception as e:
+            logger.debug(f"Could not write Coqui model manifest: {e}")
+    
+    def synthesize(self, text: str, output_path: str, style: str = "neutral", 
                   intensity: int = 50, **kwargs) -> bool:
         """Synthesize using Coqui TTS"""
-        if not self.available:
+        if not self._ensure_loaded():
             return False
             
         try:
             # Style mapping for Coqui TTS
             style_params = self._get_style_params(style, intensity)
             
-            logger.info(f"Synthesizing with Coqui TTS: style={style}, intensity={intensity}")
+            logger.info("Synthesizing with Coqui TTS: style=%s, intensity=%d", style, intensity)
             
             # Generate audio
-            self.tts.tts_to_file(
-                text=text,
-                file_path=str(output_path),
-                **style_params
-            )
+            with self._synth_lock:
+                self.tts.tts_to_file(
+                    text=text,
+                    file_path=output_path,
+                    **style_params
+                )
             
-            logger.info(f"✓ Audio generated successfully: {output_path}")
+            logger.info("✓ Audio generated successfully: %s", output_path)
             return True
             
         except Exception as e:
-            logger.error(f"Coqui TTS synthesis failed: {e}")
+            logger.error("Coqui TTS synthesis failed: %s", e)
             return False
     
     def _get_style_params(self, style: str, intensity: int) -> Dict[str, Any]:
         """Map style and intensity to Coqui TTS parameters"""
-        # Base parameters
-        params = {}
+        config = _COQUI_STYLE[style]
+        if config is None:
+            return {}
         
         # Intensity scaling (0-100 -> 0.5-1.5)
         intensity_scale = 0.5 + (intensity / 100.0)
         
-        # Style-specific adjustments
-        style_configs = {
-            "neutral": {},
-            "enthusiastic": {"speed": 1.1 * intensity_scale},
-            "somber": {"speed": 0.8 / intensity_scale},
-            "confident": {"speed": 1.0 * intensity_scale},
-            "authoritative": {"speed": 0.9 * intensity_scale}
-        }
-        
-        return style_configs.get(style, {})
+        speed, inverse = config
+        return {"speed": speed / intensity_scale if inverse else speed * intensity_scale}
 
 
 class PyttsxEngine(TTSEngine):
@@ -114,66 +291,165 @@ class PyttsxEngine(TTSEngine):
     def __init__(self):
         super().__init__("pyttsx3")
         self.engine = None
-        self._check_and_init()
+        self._base_rate = None
+        self._base_volume = None
+        # (voice, gender) pairs, classified once per driver instance
+        self._voice_cache: Optional[List[Tuple[Any, str]]] = None
+        self._load_lock = threading.Lock()
+        # The driver (SAPI/COM, espeak, NSSS) must not be used from two threads at once
+        self._driver_lock = threading.Lock()
+        self._probe_availability()
         
-    def _check_and_init(self):
-        """Initialize pyttsx3 if available"""
-        try:
-            import pyttsx3
-            self.engine = pyttsx3.init()
-            self.available = True
-            logger.info("✓ pyttsx3 engine initialized successfully")
-            
-        except ImportError:
+    def _probe_availability(self):
+        """Check that pyttsx3 is installed without starting a driver"""
+        self.available = importlib.util.find_spec("pyttsx3") is not None
+        if not self.available:
             logger.warning("pyttsx3 not available - install with: pip install pyttsx3")
-            self.available = False
-        except Exception as e:
-            logger.warning(f"pyttsx3 initialization failed: {e}")
-            self.available = False
     
-    def synthesize(self, text: str, output_path: Path, style: str = "neutral", 
+    def _ensure_loaded(self) -> bool:
+        """Start the pyttsx3 driver on first use; thread-safe and attempted only once"""
+        if self.engine is not None:
+            return True
+        
+        with self._load_lock:
+            if self.engine is not None:
+                return True
+            if not self.available:
+                return False
+            
+            try:
+                import pyttsx3
+                self.engine = pyttsx3.init()
+                self._voice_cache = None
+                
+                # Styles scale these driver defaults, never the last applied values
+                self._base_rate = self.engine.getProperty('rate')
+                self._base_volume = self.engine.getProperty('volume')
+                logger.info("✓ pyttsx3 engine initialized successfully")
+                return True
+                
+            except Exception as e:
+                logger.warning(f"pyttsx3 initialization failed: {e}")
+                self.available = False
+                return False
+    
+    def synthesize(self, text: str, output_path: str, style: str = "neutral", 
                   intensity: int = 50, voice: Optional[str] = None, **kwargs) -> bool:
         """Synthesize using pyttsx3"""
-        if not self.available:
+        if not self._ensure_loaded():
             return False
             
+        scratch = self._scratch_path(output_path)
         try:
-            # Apply voice selection
-            if voice is not None:
-                self._select_voice(voice)
-            
-            # Apply style parameters
-            self._apply_style(style, intensity)
+            with self._driver_lock:
+                # Apply voice selection
+                if voice is not None:
+                    self._select_voice(voice)
+                
+                # Apply style parameters
+                self._apply_style(style, intensity)
+                
+                logger.info("Synthesizing with pyttsx3: style=%s, intensity=%d", style, intensity)
+                
+                # Generate audio
+                self.engine.save_to_file(text, scratch)
+                self.engine.runAndWait()
             
-            logger.info(f"Synthesizing with pyttsx3: style={style}, intensity={intensity}")
+            if not os.path.exists(scratch):
+                logger.error("pyttsx3 synthesis produced no audio")
+                return False
+            self._move_into_place(scratch, output_path)
             
-            # Generate audio
-            self.engine.save_to_file(text, str(output_path))
-            self.engine.runAndWait()
-            
-            logger.info(f"✓ Audio generated successfully: {output_path}")
+            logger.info("✓ Audio generated successfully: %s", output_path)
             return True
             
         except Exception as e:
-            logger.error(f"pyttsx3 synthesis failed: {e}")
+            logger.error("pyttsx3 synthesis failed: %s", e)
             return False
+        finally:
+            self._discard_scratch(scratch)
+    
+    def synthesize_many(self, items: List[Dict[str, Any]]) -> List[bool]:
+        """Synthesize several utterances with a single runAndWait.
+        
+        Each item is a dict with text and output_path, plus optional
+        style, intensity and voice. Returns one success flag per item.
+        """
+        if not self._ensure_loaded():
+            return [False] * len(items)
+            
+        staged = []
+        try:
+            with self._driver_lock:
+                # Property changes and save requests are queued in order,
+                # so every utterance keeps its own voice and style
+                for item in items:
+                    if item.get("voice") is not None:
+                        self._select_voice(item["voice"])
+                    self._apply_style(item.get("style", "neutral"), item.get("intensity", 50))
+                    scratch = self._scratch_path(item["output_path"])
+                    staged.append((scratch, item["output_path"]))
+                    self.engine.save_to_file(item["text"], scratch)
+                
+                logger.info("Synthesizing %d utterances with pyttsx3", len(items))
+                self.engine.runAndWait()
+            
+            # Judge each item by its own scratch file, never by a stale output
+            results = []
+            for scratch, output_path in staged:
+                produced = os.path.exists(scratch)
+                if produced:
+                    self._move_into_place(scratch, output_path)
+                results.append(produced)
+            return results
+            
+        except Exception as e:
+            logger.error("pyttsx3 batch synthesis failed: %s", e)
+            for scratch, _ in staged:
+                self._discard_scratch(scratch)
+            return [False] * len(items)
+    
+    @staticmethod
+    def _scratch_path(output_path: str) -> str:
+        """Unique scratch file keeping the output's extension (drivers pick the format from it)"""
+        suffix = os.path.splitext(output_path)[1] or ".wav"
+        return os.path.join(SCRATCH_DIR, f"esg_{os.getpid()}_{uuid.uuid4().hex}{suffix}")
+    
+    @staticmethod
+    def _move_into_place(scratch: str, output_path: str):
+        """Rename scratch onto output_path, copying when they are on different filesystems"""
+        try:
+            os.replace(scratch, output_path)
+        except OSError:
+            # /dev/shm is its own filesystem: copy beside the target and rename,
+            # so the output is never rewritten in place
+            _atomic_copy(scratch, output_path)
+            os.unlink(scratch)
+    
+    @staticmethod
+    def _discard_scratch(scratch: str):
+        """Remove a scratch file that was not moved into place"""
+        try:
+            os.unlink(scratch)
+        except FileNotFoundError:
+            pass
     
     def _select_voice(self, voice_query: str):
         """Select voice by index, name, or gender"""
-        voices = self.engine.getProperty('voices')
+        voices = [v for v, _ in self._classify_voices()]
         
         # Handle gender-based selection
         if voice_query.lower() in ['female', 'woman', 'wanita', 'perempuan']:
-            female_voice = self._find_female_voice(voices)
+            female_voice = self._find_female_voice()
             if female_voice:
                 self.engine.setProperty('voice', female_voice.id)
-                logger.info(f"Selected female voice: {getattr(female_voice, 'name', 'Unknown')}")
+                logger.info("Selected female voice: %s", getattr(female_voice, 'name', 'Unknown'))
                 return
         elif voice_query.lower() in ['male', 'man', 'pria', 'laki-laki']:
-            male_voice = self._find_male_voice(voices)
+            male_voice = self._find_male_voice()
             if male_voice:
                 self.engine.setProperty('voice', male_voice.id)
-                logger.info(f"Selected male voice: {getattr(male_voice, 'name', 'Unknown')}")
+                logger.info("Selected male voice: %s", getattr(male_voice, 'name', 'Unknown'))
                 return
         
         # Try index selection
@@ -181,93 +457,81 @@ class PyttsxEngine(TTSEngine):
             idx = int(voice_query)
             if 0 <= idx < len(voices):
                 self.engine.setProperty('voice', voices[idx].id)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Selected voice %d: %s", idx, getattr(voices[idx], 'name', 'Unknown'))
                 return
         except ValueError:
             pass
         
         # Try name matching
+        query = voice_query.lower()
         for v in voices:
-            if voice_query.lower() in getattr(v, 'name', '').lower():
+            if query in getattr(v, 'name', '').lower():
                 self.engine.setProperty('voice', v.id)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Selected voice by name: %s", getattr(v, 'name', 'Unknown'))
                 return
+        
+        logger.debug("No voice matches %r, keeping the current voice", voice_query)
+    
+    def _classify_voices(self) -> List[Tuple[Any, str]]:
+        """Driver voices paired with their detected gender, computed once"""
+        if self._voice_cache is None:
+            self._voice_cache = [
+                (v, _detect_gender(getattr(v, 'name', '')))
+                for v in self.engine.getProperty('voices')
+            ]
+        return self._voice_cache
+    
+    def refresh_voices(self):
+        """Drop the classified voice list so the next lookup re-reads the driver"""
+        self._voice_cache = None
     
-    def _find_female_voice(self, voices):
+    def _find_female_voice(self):
         """Find a female voice from available voices"""
-        # Common female voice indicators
-        female_indicators = [
-            'zira', 'hazel', 'susan', 'anna', 'helena', 'sabina', 'katja',
-            'female', 'woman', 'girl', 'lady', 'ms', 'miss', 'mrs',
-            'f+', '+f', '(f)', '[f]', 'fem'
-        ]
-        
-        for voice in voices:
-            name = getattr(voice, 'name', '').lower()
-            # Check for female indicators in voice name
-            if any(indicator in name for indicator in female_indicators):
-                return voice
+        classified = self._classify_voices()
         
         # If no clear female voice found, return first voice (often default female)
-        return voices[0] if voices else None
+        fallback = classified[0][0] if classified else None
+        return next((v for v, gender in classified if gender == 'female'), fallback)
     
-    def _find_male_voice(self, voices):
+    def _find_male_voice(self):
         """Find a male voice from available voices"""
-        # Common male voice indicators
-        male_indicators = [
-            'david', 'mark', 'richard', 'george', 'james', 'paul',
-            'male', 'man', 'boy', 'gentleman', 'mr', 'mister',
-            'm+', '+m', '(m)', '[m]', 'masc'
-        ]
-        
-        for voice in voices:
-            name = getattr(voice, 'name', '').lower()
-            # Check for male indicators in voice name
-            if any(indicator in name for indicator in male_indicators):
-                return voice
+        classified = self._classify_voices()
         
         # If no clear male voice found, return second voice if available
-        return voices[1] if len(voices) > 1 else voices[0] if voices else None
+        fallback = classified[1][0] if len(classified) > 1 else classified[0][0] if classified else None
+        return next((v for v, gender in classified if gender == 'male'), fallback)
     
     def _apply_style(self, style: str, intensity: int):
         """Apply style parameters to pyttsx3 engine"""
-        base_rate = self.engine.getProperty('rate')
-        base_volume = self.engine.getProperty('volume')
+        base_rate = self._base_rate
+        base_volume = self._base_volume
         
         # Intensity scaling
         intensity_factor = 0.5 + (intensity / 100.0)
         
-        # Style configurations
-        style_configs = {
-            "neutral": {"rate_mult": 1.0, "volume_mult": 1.0},
-            "enthusiastic": {"rate_mult": 1.3, "volume_mult": 1.2},
-            "somber": {"rate_mult": 0.7, "volume_mult": 0.8},
-            "confident": {"rate_mult": 1.1, "volume_mult": 1.1},
-            "authoritative": {"rate_mult": 0.9, "volume_mult": 1.0}
-        }
-        
-        config = style_configs.get(style, style_configs["neutral"])
+        # DualTTSSystem resolves unknown styles, so every style has an entry
+        rate_mult, volume_mult = _PYTTSX_STYLE[style]
         
         # Apply parameters
-        new_rate = int(base_rate * config["rate_mult"] * intensity_factor)
-        new_volume = min(1.0, base_volume * config["volume_mult"] * intensity_factor)
+        new_rate = int(base_rate * rate_mult * intensity_factor)
+        new_volume = min(1.0, base_volume * volume_mult * intensity_factor)
         
         self.engine.setProperty('rate', new_rate)
         self.engine.setProperty('volume', new_volume)
     
     def list_voices(self):
         """List available voices with gender detection"""
-        if not self.available:
+        if not self._ensure_loaded():
             return []
             
-        voices = self.engine.getProperty('voices')
         voice_list = []
         
-        for i, v in enumerate(voices):
+        for i, (v, gender) in enumerate(self._classify_voices()):
             name = getattr(v, 'name', 'Unknown')
             lang = getattr(v, 'languages', ['Unknown'])
             
-            # Detect gender
-            gender = self._detect_gender(name)
-            
             voice_info = {
                 'index': i,
                 'name': name,
@@ -278,37 +542,63 @@ class PyttsxEngine(TTSEngine):
             voice_list.append(voice_info)
             
         return voice_list
+
+
+class AudioCache:
+    """Disk cache of synthesized WAVs keyed by (engine, style, intensity, voice, text)"""
     
-    def _detect_gender(self, voice_name: str) -> str:
-        """Detect gender from voice name"""
-        name_lower = voice_name.lower()
-        
-        # Female indicators
-        female_indicators = [
-            'zira', 'hazel', 'susan', 'anna', 'helena', 'sabina', 'katja',
-            'female', 'woman', 'girl', 'lady', 'ms', 'miss', 'mrs',
-            'f+', '+f', '(f)', '[f]', 'fem'
-        ]
-        
-        # Male indicators  
-        male_indicators = [
-            'david', 'mark', 'richard', 'george', 'james', 'paul',
-            'male', 'man', 'boy', 'gentleman', 'mr', 'mister',
-            'm+', '+m', '(m)', '[m]', 'masc'
-        ]
-        
-        if any(indicator in name_lower for indicator in female_indicators):
-            return 'female'
-        elif any(indicator in name_lower for indicator in male_indicators):
-            return 'male'
-        else:
-            return 'unknown'
+    def __init__(self, cache_dir: Path = CACHE_ROOT):
+        self.cache_dir = cache_dir
+        
+    @staticmethod
+    def key(engine: str, style: str, intensity: int, voice: Optional[str], text: str) -> str:
+        """Content hash identifying one synthesis request"""
+        data = f"{engine}|{style}|{intensity}|{voice}|{text}".encode()
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    def fetch(self, key: str, output_path: str) -> bool:
+        """Copy the cached audio to output_path; False on a cache miss"""
+        cached = self.cache_dir / f"{key}.wav"
+        if not cached.exists():
+            return False
+        # Always a copy: a hardlink would let later writes to the output rewrite the entry
+        _atomic_copy(cached, output_path)
+        return True
+    
+    def store(self, key: str, output_path: str):
+        """Add freshly synthesized audio to the cache"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cached = self.cache_dir / f"{key}.wav"
+        with self._locked(key):
+            if not cached.exists():
+                _atomic_copy(output_path, cached)
+    
+    @contextmanager
+    def _locked(self, key: str):
+        """Serialize writers of one entry across processes (no-op without fcntl)"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.cache_dir / f"{key}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+
+class NoEngineAvailable(RuntimeError):
+    """Raised when neither Coqui TTS nor pyttsx3 can be used"""
 
 
 class DualTTSSystem:
     """Dual Engine TTS System with auto-fallback"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
+        self.cache = AudioCache() if use_cache else None
+        
+        # Engines only probe for their packages here; models load on first synthesis
         self.coqui = CoquiTTSEngine()
         self.pyttsx = PyttsxEngine()
         
@@ -322,37 +612,149 @@ class DualTTSSystem:
             self.fallback = None
             logger.info("Primary engine: pyttsx3 (Coqui TTS not available)")
         else:
-            logger.error("No TTS engines available!")
-            sys.exit(1)
+            raise NoEngineAvailable("No TTS engines available!")
     
-    def synthesize(self, text: str, output_path: Path, engine: str = "auto", **kwargs) -> bool:
-        """Synthesize with specified or auto-selected engine"""
-        
-        # Engine selection
+    def _fallback_for(self, engine: TTSEngine) -> Optional[TTSEngine]:
+        """Engine to retry with when the primary engine fails"""
+        return self.fallback if engine is self.primary else None
+    
+    def _fetch_cached(self, engine: TTSEngine, text: str, output_path: str,
+                      params: Dict[str, Any]) -> bool:
+        """Serve earlier audio that engine produced for the same request"""
+        if self.cache is None:
+            return False
+        key = self.cache.key(engine.name, params.get("style", "neutral"),
+                             params.get("intensity", 50), params.get("voice"), text)
+        try:
+            if self.cache.fetch(key, output_path):
+                logger.info("✓ Audio served from cache: %s", output_path)
+                return True
+        except OSError as e:
+            logger.warning("Audio cache read failed: %s", e)
+        return False
+    
+    def _store_cached(self, engine: TTSEngine, text: str, output_path: str,
+                      params: Dict[str, Any]):
+        """Cache audio under the engine that actually produced it"""
+        if self.cache is None:
+            return
+        key = self.cache.key(engine.name, params.get("style", "neutral"),
+                             params.get("intensity", 50), params.get("voice"), text)
+        try:
+            self.cache.store(key, output_path)
+        except OSError as e:
+            logger.warning("Audio cache write failed: %s", e)
+    
+    def _select_engine(self, engine: str) -> Optional[TTSEngine]:
+        """Resolve an engine name to an engine instance"""
         if engine == "auto":
-            selected_engine = self.primary
+            return self.primary
         elif engine == "coqui":
             if not self.coqui.available:
                 logger.warning("Coqui TTS not available, falling back to pyttsx3")
-                selected_engine = self.pyttsx
-            else:
-                selected_engine = self.coqui
+                return self.pyttsx
+            return self.coqui
         elif engine == "pyttsx3":
-            selected_engine = self.pyttsx
+            return self.pyttsx
         else:
-            logger.error(f"Unknown engine: {engine}")
+            logger.error("Unknown engine: %s", engine)
+            return None
+    
+    def synthesize(self, text: str, output_path: Union[str, os.PathLike], engine: str = "auto",
+                   **kwargs) -> bool:
+        """Synthesize with specified or auto-selected engine"""
+        
+        # Engines, cache and logs all take the plain string form
+        output_path = os.fspath(output_path)
+        
+        # Engine selection
+        selected_engine = self._select_engine(engine)
+        if selected_engine is None:
             return False
         
+        kwargs["style"] = _resolve_style(kwargs.get("style", "neutral"))
+        
+        # Identical requests reuse earlier audio instead of re-running the model
+        if self._fetch_cached(selected_engine, text, output_path, kwargs):
+            return True
+        
         # Attempt synthesis
+        producer = selected_engine
         success = selected_engine.synthesize(text, output_path, **kwargs)
         
         # Auto-fallback if primary fails
-        if not success and self.fallback and selected_engine == self.primary:
-            logger.warning(f"Primary engine failed, trying fallback: {self.fallback.name}")
-            success = self.fallback.synthesize(text, output_path, **kwargs)
+        fallback = self._fallback_for(selected_engine)
+        if not success and fallback:
+            logger.warning("Primary engine failed, trying fallback: %s", fallback.name)
+            if self._fetch_cached(fallback, text, output_path, kwargs):
+                return True
+            producer = fallback
+            success = fallback.synthesize(text, output_path, **kwargs)
+        
+        if success:
+            self._store_cached(producer, text, output_path, kwargs)
         
         return success
     
+    def synthesize_batch(self, items: List[Dict[str, Any]], max_workers: int = 1) -> List[bool]:
+        """Synthesize many requests, grouping them by engine.
+        
+        Each item holds synthesize() keyword arguments (text, output_path,
+        engine, style, intensity, voice). pyttsx3 items share one driver
+        run on the calling thread; the rest go through a pool of
+        max_workers threads sharing the loaded models. Results keep input order.
+        """
+        results = [False] * len(items)
+        pyttsx_batch = []
+        pooled = []
+        
+        for i, item in enumerate(items):
+            selected_engine = self._select_engine(item.get("engine", "auto"))
+            if selected_engine is self.pyttsx:
+                pyttsx_batch.append(i)
+            elif selected_engine is not None:
+                pooled.append(i)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {i: executor.submit(self.synthesize, **items[i]) for i in pooled}
+            
+            if pyttsx_batch:
+                self._synthesize_pyttsx_batch(items, pyttsx_batch, results)
+            
+            for i, future in futures.items():
+                results[i] = future.result()
+        
+        return results
+    
+    def _synthesize_pyttsx_batch(self, items: List[Dict[str, Any]], indices: List[int],
+                                 results: List[bool]):
+        """Run the pyttsx3 share of a batch with the same cache and fallback as synthesize()"""
+        pending = []
+        for i in indices:
+            item = {**items[i], "output_path": os.fspath(items[i]["output_path"]),
+                    "style": _resolve_style(items[i].get("style", "neutral"))}
+            if self._fetch_cached(self.pyttsx, item["text"], item["output_path"], item):
+                results[i] = True
+            else:
+                pending.append((i, item))
+        
+        if not pending:
+            return
+        
+        batch_results = self.pyttsx.synthesize_many([item for _, item in pending])
+        fallback = self._fallback_for(self.pyttsx)
+        
+        for (i, item), success in zip(pending, batch_results):
+            producer = self.pyttsx
+            if not success and fallback:
+                logger.warning("Primary engine failed, trying fallback: %s", fallback.name)
+                producer = fallback
+                params = {k: item[k] for k in ("style", "intensity", "voice") if k in item}
+                success = fallback.synthesize(item["text"], item["output_path"], **params)
+            if success:
+                self._store_cached(producer, item["text"], item["output_path"], item)
+            results[i] = success
+    
     def get_status(self) -> Dict[str, bool]:
         """Get engine availability status"""
         return {
@@ -394,26 +796,229 @@ class DualTTSSystem:
         return None
 
 
-def validate_inputs(text: str, output_path: Path) -> bool:
+def validate_inputs(text: str, output_path: Union[str, os.PathLike]) -> bool:
     """Validate input parameters"""
     if not text.strip():
         logger.error("Text input cannot be empty")
         return False
     
     # Create output directory if needed
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    parent = Path(output_path).parent
+    try:
+        parent.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.error(f"Cannot create output directory: {e}")
+        return False
+    
+    # Check the directory is writable without creating the target file,
+    # so a failed synthesis never leaves an empty WAV behind
+    if not os.access(parent, os.W_OK):
+        logger.error(f"Cannot write to output directory: {parent}")
+        return False
+    
+    return True
+
+
+def _intern(value: Any) -> Any:
+    """Intern decoded style/engine names so table lookups hit the canonical string"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
+class SynthRequest:
+    """One synthesis request decoded from a --batch line or a daemon message"""
+    text: str
+    output: str
+    style: str = "neutral"
+    intensity: int = 50
+    engine: str = "auto"
+    voice: Optional[str] = None
+    
+    def __post_init__(self):
+        self.intensity = int(self.intensity)
+        self.style = _intern(self.style)
+        self.engine = _intern(self.engine)
     
-    # Check if output path is writable
+    def to_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for DualTTSSystem.synthesize()"""
+        return {
+            "text": self.text,
+            "output_path": self.output,
+            "engine": self.engine,
+            "style": self.style,
+            "intensity": self.intensity,
+            "voice": self.voice
+        }
+
+
+def load_batch(batch_path: Path, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Read JSONL batch requests into synthesize() keyword arguments"""
+    defaults = {"style": args.style, "intensity": args.intensity,
+                "engine": args.engine, "voice": args.voice}
+    items = []
+    with open(batch_path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            request = SynthRequest(**{**defaults, **json.loads(line)})
+            items.append(request.to_kwargs())
+    return items
+
+
+def run_batch(tts_system: DualTTSSystem, batch_path: Path, args: argparse.Namespace) -> int:
+    """Synthesize a JSONL batch with one shared DualTTSSystem"""
     try:
-        output_path.touch()
+        items = load_batch(batch_path, args)
+    except (OSError, ValueError, TypeError) as e:
+        logger.error(f"Cannot read batch file {batch_path}: {e}")
+        return 1
+    
+    valid = [
+        item for item in items
+        if 0 <= item["intensity"] <= 100 and validate_inputs(item["text"], item["output_path"])
+    ]
+    if len(valid) < len(items):
+        logger.error(f"Skipping {len(items) - len(valid)} invalid batch requests")
+    
+    logger.info(f"Starting batch synthesis: {len(valid)} requests, "
+                f"max concurrency {args.max_concurrency}")
+    results = tts_system.synthesize_batch(valid, max_workers=max(1, args.max_concurrency))
+    
+    succeeded = sum(results)
+    if succeeded == len(items):
+        logger.info(f"✓ Batch completed: {succeeded}/{len(items)} succeeded")
+        return 0
+    else:
+        logger.error(f"✗ Batch completed with failures: {succeeded}/{len(items)} succeeded")
+        return 1
+
+
+class SynthesisRequestHandler(socketserver.StreamRequestHandler):
+    """Serve one JSON request line per connection with the daemon's DualTTSSystem"""
+    
+    def handle(self):
+        line = self.rfile.readline()
+        # Liveness probes (see _daemon_listening) connect and close without a request
+        if not line.strip():
+            return
+        
+        try:
+            request = SynthRequest(**json.loads(line))
+            
+            if not 0 <= request.intensity <= 100 or not validate_inputs(request.text, request.output):
+                reply = {"ok": False, "error": "invalid request"}
+            else:
+                success = self.server.tts_system.synthesize(
+                    text=request.text,
+                    output_path=request.output,
+                    engine=request.engine,
+                    style=request.style,
+                    intensity=request.intensity,
+                    voice=request.voice
+                )
+                reply = {"ok": success}
+        except Exception as e:
+            reply = {"ok": False, "error": f"bad request: {e}"}
+        
+        try:
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("Client disconnected before the reply was sent")
+
+
+def serve(tts_system: DualTTSSystem, socket_path: str) -> int:
+    """Keep the TTS system resident and answer requests on a Unix socket"""
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        logger.error("--serve needs Unix domain sockets, which this platform lacks")
+        return 1
+    
+    # Only replace a stale socket of ours left by a daemon that did not shut down cleanly
+    if os.path.lexists(socket_path):
+        st = os.lstat(socket_path)
+        if not stat.S_ISSOCK(st.st_mode):
+            logger.error(f"{socket_path} exists and is not a socket, refusing to replace it")
+            return 1
+        if st.st_uid != os.getuid():
+            logger.error(f"{socket_path} belongs to another user, refusing to replace it")
+            return 1
+        if _daemon_listening(socket_path):
+            logger.error(f"A synthesis daemon is already listening on {socket_path}")
+            return 1
+        os.unlink(socket_path)
+    
+    # Clients can make the daemon write files, so only our user may connect;
+    # the umask closes the window between bind() and a later chmod
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(socket_path, SynthesisRequestHandler)
+    finally:
+        os.umask(old_umask)
+    
+    with server:
+        server.daemon_threads = True
+        server.tts_system = tts_system
+        
+        logger.info(f"✓ Synthesis daemon listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Shutting down synthesis daemon")
+        finally:
+            os.unlink(socket_path)
+    return 0
+
+
+def _daemon_listening(socket_path: str) -> bool:
+    """True when something accepts connections on socket_path"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
         return True
-    except Exception as e:
-        logger.error(f"Cannot write to output path: {e}")
+    except (FileNotFoundError, ConnectionRefusedError):
         return False
 
 
-def main():
-    """Main CLI interface"""
+def forward_to_daemon(socket_path: str, request: SynthRequest) -> Optional[bool]:
+    """Send a request to a running daemon; None when no daemon is listening"""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    
+    # Never hand text to a socket another user could have planted
+    try:
+        st = os.stat(socket_path)
+    except FileNotFoundError:
+        return None
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        logger.warning(f"Ignoring {socket_path}: not a socket owned by this user")
+        return None
+    
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            logger.info(f"Forwarding request to synthesis daemon at {socket_path}")
+            sock.sendall(json.dumps(asdict(request)).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reply_file:
+                reply = json.loads(reply_file.readline())
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Synthesis daemon did not answer ({e}), synthesizing locally")
+        return None
+    
+    if reply.get("error"):
+        logger.error(f"Synthesis daemon rejected request: {reply['error']}")
+    return bool(reply.get("ok"))
+
+
+def _default_concurrency() -> int:
+    """CPUs this process may run on (respects affinity/cpuset limits where supported)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser"""
     parser = argparse.ArgumentParser(
         description="Emotional Speech Generation - Dual Engine TTS System",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -425,6 +1030,8 @@ Examples:
   python solution.py "Text here" out.wav --engine pyttsx3 --voice 1
   python solution.py --list-voices
   python solution.py --status
+  python solution.py --batch requests.jsonl --max-concurrency 4
+  python solution.py --serve
         """
     )
     
@@ -432,7 +1039,7 @@ Examples:
     parser.add_argument("output", nargs="?", help="Output WAV file path")
     
     parser.add_argument("--style", default="neutral", 
-                       choices=["neutral", "enthusiastic", "somber", "confident", "authoritative"],
+                       choices=list(_PYTTSX_STYLE),
                        help="Speech style (default: neutral)")
     
     parser.add_argument("--intensity", type=int, default=50, metavar="0-100",
@@ -444,6 +1051,20 @@ Examples:
     
     parser.add_argument("--voice", help="Voice selection (pyttsx3 only: index or name)")
     
+    parser.add_argument("--batch", metavar="FILE",
+                       help="Synthesize every request in a JSONL file, one object per line "
+                            "with text and output (style, intensity, engine, voice optional; "
+                            "defaults come from the other flags)")
+    
+    parser.add_argument("--max-concurrency", type=int, default=_default_concurrency(), metavar="N",
+                       help="Parallel syntheses in batch mode (default: CPUs available to this process)")
+    
+    parser.add_argument("--serve", action="store_true",
+                       help="Run a resident synthesis daemon that later CLI calls forward to")
+    
+    parser.add_argument("--socket", default=SOCKET_PATH, metavar="PATH",
+                       help=f"Daemon socket path (default: {SOCKET_PATH})")
+    
     parser.add_argument("--list-voices", action="store_true",
                        help="List available voices and exit")
     
@@ -453,27 +1074,57 @@ Examples:
     parser.add_argument("--verbose", "-v", action="store_true",
                        help="Enable verbose logging")
     
-    args = parser.parse_args()
+    return parser
+
+
+def _cli_system() -> Optional[DualTTSSystem]:
+    """Create the TTS system for a CLI command; None (after logging) when no engine exists"""
+    try:
+        return DualTTSSystem()
+    except NoEngineAvailable as e:
+        logger.error(f"{e} Install pyttsx3 or Coqui TTS (see requirements.txt)")
+        return None
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main CLI interface"""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
     
     # Configure logging level
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    # Initialize TTS system
-    tts_system = DualTTSSystem()
-    
-    # Handle special commands
+    # Status reports missing engines instead of failing on them
     if args.status:
-        status = tts_system.get_status()
+        try:
+            status = DualTTSSystem().get_status()
+        except NoEngineAvailable:
+            status = {"coqui": False, "pyttsx3": False}
         print("TTS Engine Status:")
         for engine, available in status.items():
             status_str = "✓ Available" if available else "✗ Not Available"
             print(f"  {engine}: {status_str}")
         return 0
     
-    if args.list_voices:
-        tts_system.pyttsx.list_voices()
-        return 0
+    if args.serve:
+        tts_system = _cli_system()
+        return serve(tts_system, args.socket) if tts_system else 1
+    
+    # Handle special commands
+    if args.list_voices or args.batch:
+        tts_system = _cli_system()
+        if tts_system is None:
+            return 1
+        
+        if args.list_voices:
+            for engine, voices in tts_system.get_voices().items():
+                print(f"[{engine}]")
+                for v in voices:
+                    print(f"  {v.get('index', '-')}: {v['name']} ({v['gender']})")
+            return 0
+        
+        return run_batch(tts_system, Path(args.batch), args)
     
     # Validate required arguments
     if not args.text or not args.output:
@@ -491,14 +1142,28 @@ Examples:
     # Synthesize
     logger.info(f"Starting synthesis: '{args.text[:50]}{'...' if len(args.text) > 50 else ''}'")
     
-    success = tts_system.synthesize(
+    # A running daemon already has the models loaded
+    success = forward_to_daemon(args.socket, SynthRequest(
         text=args.text,
-        output_path=output_path,
-        engine=args.engine,
+        output=str(output_path.resolve()),
         style=args.style,
         intensity=args.intensity,
+        engine=args.engine,
         voice=args.voice
-    )
+    ))
+    
+    if success is None:
+        tts_system = _cli_system()
+        if tts_system is None:
+            return 1
+        success = tts_system.synthesize(
+            text=args.text,
+            output_path=output_path,
+            engine=args.engine,
+            style=args.style,
+            intensity=args.intensity,
+            voice=args.voice
+        )
     
     if success:
         logger.info("✓ Synthesis completed successfully!")